@@ -7,6 +7,7 @@ from pathlib import Path
 from .config import EvalConfig
 from .evaluator import Evaluator
 from .dataset_manager import DatasetManager
+from .vllm_service import VLLMService
 
 
 def main():
@@ -25,6 +26,13 @@ Examples:
   # Use multiple GPUs
   evalscope-toolkit --models "large-model" --datasets gsm8k --gpus "0,1" --tp-size 2
   
+  # Evaluate several small models concurrently, one replica per GPU
+  evalscope-toolkit --models "model1,model2" --datasets gsm8k --gpus "0,1" --parallel-replicas
+  
+  # Keep a vLLM server running, then evaluate against it
+  evalscope-toolkit --models "unsloth/Llama-3.2-3B-Instruct" --serve
+  evalscope-toolkit --models "unsloth/Llama-3.2-3B-Instruct" --datasets gsm8k --reuse-server
+  
   # List supported datasets
   evalscope-toolkit --list-datasets
         """
@@ -55,19 +63,77 @@ Examples:
         default=1,
         help="Tensor parallel size (default: 1)"
     )
+    parser.add_argument(
+        "--dp-size",
+        type=int,
+        default=1,
+        help="Data parallel replicas inside one vLLM server; use dp-size * tp-size "
+             "= number of GPUs for small models (default: 1)"
+    )
     parser.add_argument(
         "--gpu-mem-util",
         type=float,
         default=0.6,
         help="GPU memory utilization (default: 0.6)"
     )
+    parser.add_argument(
+        "--max-num-seqs",
+        type=int,
+        default=256,
+        help="Maximum concurrent sequences per vLLM iteration (default: 256)"
+    )
+    parser.add_argument(
+        "--max-num-batched-tokens",
+        type=int,
+        default=8192,
+        help="Maximum tokens per vLLM scheduler step (default: 8192)"
+    )
+    parser.add_argument(
+        "--async-scheduling",
+        action="store_true",
+        help="Enable vLLM async scheduling (recent vLLM releases only; incompatible "
+             "with speculative decoding / pipeline parallelism)"
+    )
+    parser.add_argument(
+        "--no-prefix-caching",
+        action="store_true",
+        help="Disable vLLM automatic prefix caching"
+    )
+    parser.add_argument(
+        "--parallel-replicas",
+        action="store_true",
+        help="Evaluate models concurrently, one vLLM replica per tp-size GPU shard"
+    )
+    
+    # Service configuration
+    parser.add_argument(
+        "--base-port",
+        type=int,
+        default=8800,
+        help="Port of the --serve server, probed by --reuse-server; evaluation "
+             "servers use free ports assigned by the kernel (default: 8800)"
+    )
+    parser.add_argument(
+        "--reuse-server",
+        action="store_true",
+        help="Evaluate against a server started with --serve on --base-port "
+             "when it already hosts the model, instead of starting a new one"
+    )
     
     # Evaluation parameters
     parser.add_argument(
         "--eval-batch-size",
         type=int,
-        default=32,
-        help="Evaluation batch size (default: 32)"
+        default=128,
+        help="Evaluation batch size (default: 128)"
+    )
+    parser.add_argument(
+        "--eval-concurrency",
+        type=int,
+        default=1,
+        help="Concurrent evalscope clients per model, one dataset each; values above 1 "
+             "always run evalscope as separate processes (default: 1, all datasets "
+             "in a single evalscope run)"
     )
     parser.add_argument(
         "--max-new-tokens",
@@ -87,6 +153,11 @@ Examples:
         default=1.0,
         help="Top-p sampling (default: 1.0)"
     )
+    parser.add_argument(
+        "--subprocess-eval",
+        action="store_true",
+        help="Run evalscope in a separate process instead of in-process"
+    )
     
     # Directory configuration
     parser.add_argument(
@@ -112,11 +183,22 @@ Examples:
         action="store_true",
         help="List all supported datasets and exit"
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Start a vLLM server for the first model on --base-port and block; "
+             "evaluations run with --reuse-server use it instead of starting their own"
+    )
     parser.add_argument(
         "--download-datasets",
         type=str,
         help="Download specified datasets (comma-separated) and exit"
     )
+    parser.add_argument(
+        "--force-redownload",
+        action="store_true",
+        help="Re-download datasets even if a complete local copy is cached"
+    )
     
     args = parser.parse_args()
     
@@ -140,16 +222,19 @@ Examples:
         data_root = Path(args.data_root) if args.data_root else workspace / "data"
         
         dm = DatasetManager(data_root)
-        dm.download_datasets(datasets)
+        dm.download_datasets(datasets, force=args.force_redownload)
         return 0
     
     # Validate required arguments
-    if not args.models or not args.datasets:
+    if args.serve:
+        if not args.models:
+            parser.error("--serve requires --models")
+    elif not args.models or not args.datasets:
         parser.error("--models and --datasets are required")
     
     # Parse models and datasets
     models = [m.strip() for m in args.models.split(',')]
-    datasets = [d.strip() for d in args.datasets.split(',')]
+    datasets = [d.strip() for d in args.datasets.split(',')] if args.datasets else []
     
     # Create configuration
     config_kwargs = {
@@ -157,11 +242,22 @@ Examples:
         'datasets': datasets,
         'gpus': args.gpus,
         'tensor_parallel_size': args.tp_size,
+        'data_parallel_size': args.dp_size,
         'gpu_memory_utilization': args.gpu_mem_util,
+        'max_num_seqs': args.max_num_seqs,
+        'max_num_batched_tokens': args.max_num_batched_tokens,
+        'async_scheduling': args.async_scheduling,
+        'enable_prefix_caching': not args.no_prefix_caching,
+        'parallel_replicas': args.parallel_replicas,
+        'reuse_server': args.reuse_server,
         'eval_batch_size': args.eval_batch_size,
+        'eval_concurrency': args.eval_concurrency,
         'max_new_tokens': args.max_new_tokens,
         'temperature': args.temperature,
         'top_p': args.top_p,
+        'subprocess_eval': args.subprocess_eval,
+        'force_redownload': args.force_redownload,
+        'base_port': args.base_port,
         'workspace': Path(args.workspace),
     }
     
@@ -172,6 +268,9 @@ Examples:
     
     config = EvalConfig(**config_kwargs)
     
+    if args.serve:
+        return serve(config)
+    
     # Run evaluation
     try:
         evaluator = Evaluator(config)
@@ -191,5 +290,30 @@ Examples:
         return 1
 
 
+def serve(config: EvalConfig) -> int:
+    """Run a persistent vLLM server for the first configured model
+    
+    Args:
+        config: EvalConfig instance
+        
+    Returns:
+        Exit code
+    """
+    model = config.models[0]
+    with VLLMService(config) as service:
+        try:
+            port, served_model_name = service.start(model, config.log_root, port=config.base_port)
+        except Exception as e:
+            print(f"\n⚠ vLLM server failed to start: {e}", file=sys.stderr)
+            return 1
+        
+        print(f"\n✓ Serving {served_model_name} on http://127.0.0.1:{port} (Ctrl+C to stop)")
+        try:
+            return service.process.wait()
+        except KeyboardInterrupt:
+            print("\nShutting down...")
+            return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -3,9 +3,25 @@
 import os
 from pathlib import Path
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import List, Optional
 
 
+def _base_dataset_args() -> dict:
+    """Build a fresh copy of the arguments shared by every dataset"""
+    return {
+        "few_shot_num": 0,
+        "filters": {"remove_until": "</think>"},
+    }
+
+
+# Per-dataset overrides of the shared arguments
+_DATASET_ARG_OVERRIDES = {
+    "competition_math": {"train_split": "train", "eval_split": "test"},
+    "hellaswag": {"eval_split": "val"},
+}
+
+
 @dataclass
 class EvalConfig:
     """Evaluation configuration"""
@@ -19,17 +35,27 @@ class EvalConfig:
     # GPU configuration
     gpus: str = "0"
     tensor_parallel_size: int = 1
+    data_parallel_size: int = 1
     gpu_memory_utilization: float = 0.6
-    max_num_seqs: int = 64
+    max_num_seqs: int = 256
+    max_num_batched_tokens: int = 8192
+    async_scheduling: bool = False
+    enable_prefix_caching: bool = True
+    enable_chunked_prefill: bool = True
     
     # Evaluation parameters
-    eval_batch_size: int = 32
+    eval_batch_size: int = 128
+    eval_concurrency: int = 1
     max_new_tokens: int = 2048
     temperature: float = 0.0
     top_p: float = 1.0
     eval_n: int = 1
     seed: int = 42
     system_prompt: str = ""
+    subprocess_eval: bool = False
+    
+    # Dataset cache configuration
+    force_redownload: bool = False
     
     # Directory configuration
     workspace: Path = field(default_factory=lambda: Path.cwd())
@@ -39,6 +65,8 @@ class EvalConfig:
     
     # Service configuration
     base_port: int = 8800
+    parallel_replicas: bool = False
+    reuse_server: bool = False
     
     # User configuration
     user_id: str = field(default_factory=lambda: os.environ.get('USER', 'user'))
@@ -76,60 +104,29 @@ class EvalConfig:
         os.environ['VLLM_USE_MODELSCOPE'] = 'True'
         os.environ['VLLM_HOST_IP'] = '127.0.0.1'
     
-    def get_dataset_args(self):
-        """Generate dataset configuration arguments"""
+    def get_gpu_shards(self) -> List[str]:
+        """Split GPUs into shards of tensor_parallel_size * data_parallel_size GPUs
+        
+        Returns:
+            List of comma-separated GPU ID strings, one per shard
+        """
+        gpu_list = [g.strip() for g in self.gpus.split(',') if g.strip()]
+        size = max(1, self.tensor_parallel_size) * max(1, self.data_parallel_size)
+        return [
+            ','.join(gpu_list[i:i + size])
+            for i in range(0, len(gpu_list) - size + 1, size)
+        ]
+    
+    @cached_property
+    def dataset_args(self) -> dict:
+        """Dataset configuration arguments for the requested datasets (built once per config)"""
+        # An empty system prompt is evalscope's default, so leave it out
+        extra = {"system_prompt": self.system_prompt} if self.system_prompt else {}
         return {
-            "gsm8k": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt
-            },
-            "competition_math": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt,
-                "train_split": "train",
-                "eval_split": "test"
-            },
-            "humaneval": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt
-            },
-            "math_500": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt
-            },
-            "drop": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt
-            },
-            "hellaswag": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "eval_split": "val",
-                "system_prompt": self.system_prompt
-            },
-            "mmlu": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt
-            },
-            "arc": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt
-            },
-            "truthfulqa": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt
-            },
-            "winogrande": {
-                "few_shot_num": 0,
-                "filters": {"remove_until": "</think>"},
-                "system_prompt": self.system_prompt
+            name: {
+                **_base_dataset_args(),
+                **_DATASET_ARG_OVERRIDES.get(name, {}),
+                **extra,
             }
+            for name in (d.strip() for d in self.datasets)
         }
@@ -1,10 +1,20 @@
 """Dataset download and management using ModelScope"""
 
 import json
+import threading
 from pathlib import Path
 from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+from .utils import check_dependency, install_package
+
 
 class DatasetManager:
     """Manages dataset download and caching using ModelScope"""
@@ -82,47 +92,122 @@ class DatasetManager:
         self.cache_dir = Path(cache_dir)
         self.ms_cache_dir = self.cache_dir / ".modelscope_cache"
         self.ms_cache_dir.mkdir(parents=True, exist_ok=True)
+        self._print_lock = threading.Lock()
+        self._install_lock = threading.Lock()
+    
+    def __getstate__(self):
+        """Drop thread locks when sent to a worker process"""
+        state = self.__dict__.copy()
+        del state['_print_lock']
+        del state['_install_lock']
+        return state
+    
+    def __setstate__(self, state):
+        """Recreate thread locks in the worker process"""
+        self.__dict__.update(state)
+        self._print_lock = threading.Lock()
+        self._install_lock = threading.Lock()
     
-    def download_dataset(self, dataset_name: str) -> bool:
+    def get_cache_path(self, dataset_name: str) -> Optional[Path]:
+        """Get the directory where MsDataset.load cached a dataset
+        
+        Args:
+            dataset_name: Name of the dataset
+            
+        Returns:
+            Path of the ModelScope cache directory, or None if not cached
+        """
+        ms_name = self.DATASET_CONFIGS[dataset_name]['ms_name']
+        # Newer ModelScope releases nest dataset caches under "datasets/"
+        for root in (self.ms_cache_dir, self.ms_cache_dir / "datasets"):
+            path = root / ms_name
+            if path.is_dir():
+                return path
+        return None
+    
+    def _ensure_modelscope(self):
+        """Install modelscope if missing, without importing it to check"""
+        with self._install_lock:
+            if not check_dependency('modelscope'):
+                self._log("Installing modelscope package...")
+                install_package('modelscope')
+    
+    def _log(self, *lines: str):
+        """Print lines as one block so concurrent downloads stay readable"""
+        with self._print_lock:
+            print('\n'.join(lines))
+    
+    @contextmanager
+    def _dataset_lock(self, dataset_name: str):
+        """Hold an exclusive filesystem lock for one dataset
+        
+        Lets a single process download a dataset while other processes
+        sharing the cache wait and then reuse its result.
+        """
+        if fcntl is None:
+            yield
+            return
+        
+        lock_file = self.ms_cache_dir / f"{dataset_name}.lock"
+        with open(lock_file, 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def download_dataset(self, dataset_name: str, force: bool = False) -> bool:
         """Download a single dataset
         
         Args:
             dataset_name: Name of the dataset to download
+            force: Re-download even if the dataset is already cached
             
         Returns:
             True if successful, False otherwise
         """
         if dataset_name not in self.DATASET_CONFIGS:
-            print(f"⚠ Unknown dataset: {dataset_name}")
-            print(f"  Available datasets: {', '.join(self.DATASET_CONFIGS.keys())}")
+            self._log(
+                f"⚠ Unknown dataset: {dataset_name}",
+                f"  Available datasets: {', '.join(self.DATASET_CONFIGS.keys())}",
+            )
             return False
         
+        with self._dataset_lock(dataset_name):
+            return self._download_dataset(dataset_name, force)
+    
+    def _download_dataset(self, dataset_name: str, force: bool) -> bool:
+        """Download a single dataset while holding its lock"""
         config = self.DATASET_CONFIGS[dataset_name]
-        print(f"\n📥 Downloading {dataset_name}: {config['description']}")
-        print(f"  ModelScope: {config['ms_name']}")
+        header = [
+            f"\n📥 Downloading {dataset_name}: {config['description']}",
+            f"  ModelScope: {config['ms_name']}",
+        ]
         if config['subset_name']:
-            print(f"  Subset: {config['subset_name']}")
-        print(f"  Split: {config['split']}")
+            header.append(f"  Subset: {config['subset_name']}")
+        header.append(f"  Split: {config['split']}")
+        
+        # Reuse the ModelScope cache without touching the network when it is complete
+        cache_info_file = self.ms_cache_dir / f"{dataset_name}_info.json"
+        if cache_info_file.exists() and not force:
+            with open(cache_info_file) as f:
+                cache_info = json.load(f)
+            samples = cache_info.get('samples')
+            if isinstance(samples, int) and samples > 0 and self.get_cache_path(dataset_name) is not None:
+                self._log(
+                    *header,
+                    f"  Found cached dataset (downloaded: {cache_info.get('download_time', 'unknown')})",
+                    f"  Samples: {samples}",
+                    f"✓ {dataset_name}: using cached (offline)",
+                )
+                return True
+        
+        self._log(*header)
         
         try:
             # Import ModelScope
-            try:
-                from modelscope.msdatasets import MsDataset
-            except ImportError:
-                print("Installing modelscope package...")
-                import subprocess
-                import sys
-                subprocess.run([sys.executable, '-m', 'pip', 'install', 'modelscope'], check=True)
-                from modelscope.msdatasets import MsDataset
-            
-            # Check if dataset is already cached
-            cache_info_file = self.ms_cache_dir / f"{dataset_name}_info.json"
-            if cache_info_file.exists():
-                with open(cache_info_file) as f:
-                    cache_info = json.load(f)
-                print(f"  Found cached dataset (downloaded: {cache_info.get('download_time', 'unknown')})")
-                print(f"  Samples: {cache_info.get('samples', 'unknown')}")
-                print(f"  Verifying cache...")
+            self._ensure_modelscope()
+            from modelscope.msdatasets import MsDataset
             
             # Download dataset using ModelScope MsDataset
             load_kwargs = {
@@ -133,7 +218,12 @@ class DatasetManager:
             if config['subset_name']:
                 load_kwargs['subset_name'] = config['subset_name']
             
-            print(f"  Loading from ModelScope...")
+            # Without this MsDataset.load would silently reuse its own cache
+            if force:
+                from modelscope.utils.constant import DownloadMode
+                load_kwargs['download_mode'] = DownloadMode.FORCE_REDOWNLOAD
+            
+            self._log(f"  [{dataset_name}] Loading from ModelScope...")
             dataset = MsDataset.load(config['ms_name'], **load_kwargs)
             
             # Get dataset size
@@ -154,23 +244,25 @@ class DatasetManager:
             with open(cache_info_file, 'w') as f:
                 json.dump(cache_info, f, indent=2)
             
-            print(f"✓ {dataset_name} downloaded successfully")
-            print(f"  Samples: {dataset_size}")
-            print(f"  Cache info: {cache_info_file}")
+            self._log(
+                f"✓ {dataset_name} downloaded successfully",
+                f"  Samples: {dataset_size}",
+                f"  Cache info: {cache_info_file}",
+            )
             
             return True
             
         except Exception as e:
-            print(f"✗ Failed to download {dataset_name}: {e}")
             import traceback
-            traceback.print_exc()
+            self._log(f"✗ Failed to download {dataset_name}: {e}", traceback.format_exc())
             return False
     
-    def download_datasets(self, dataset_names: List[str]) -> None:
-        """Download multiple datasets
+    def download_datasets(self, dataset_names: List[str], force: bool = False) -> None:
+        """Download multiple datasets concurrently
         
         Args:
             dataset_names: List of dataset names to download
+            force: Re-download even if the datasets are already cached
         """
         print("=" * 60)
         print("Dataset Download and Preparation (ModelScope - evalscope official)")
@@ -178,8 +270,10 @@ class DatasetManager:
         print(f"Datasets to prepare: {dataset_names}")
         print(f"Cache directory: {self.ms_cache_dir}")
         
-        for dataset_name in dataset_names:
-            self.download_dataset(dataset_name.strip())
+        # Downloads are network-bound, so threads overlap them well
+        names = [name.strip() for name in dataset_names]
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(names)))) as executor:
+            list(executor.map(lambda name: self.download_dataset(name, force=force), names))
         
         print("\n" + "=" * 60)
         print("Dataset preparation completed!")
@@ -2,18 +2,65 @@
 
 import os
 import sys
+import copy
 import json
+import math
 import time
 import subprocess
+import dataclasses
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Optional
 
 from .config import EvalConfig
 from .dataset_manager import DatasetManager
 from .vllm_service import VLLMService
 
 
+_BANNER = "=" * 60
+
+
+def _emit(*lines: str):
+    """Write a block of lines to stdout with a single write call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _run_replica(evaluator: "Evaluator", models: List[str], gpus: str, shard_index: int) -> dict:
+    """Evaluate a group of models on a dedicated GPU shard (worker process entry point)
+    
+    Args:
+        evaluator: Evaluator instance (pickled into the worker)
+        models: Models to evaluate sequentially on this shard
+        gpus: Comma-separated GPU IDs assigned to this shard
+        shard_index: Index of the shard, used to spread service ports
+        
+    Returns:
+        Dictionary mapping model to its evaluation results
+    """
+    os.environ['CUDA_VISIBLE_DEVICES'] = gpus
+    evaluator.config = dataclasses.replace(
+        evaluator.config,
+        gpus=gpus,
+        base_port=evaluator.config.base_port + shard_index * 10,
+    )
+    
+    results = {}
+    for model in models:
+        print(f"[shard {shard_index} | GPUs {gpus}] Evaluating model: {model}")
+        try:
+            results[model] = evaluator.run_evaluation_for_model(model)
+        except Exception as e:
+            print(f"Error: Model {model} evaluation failed: {e}")
+            import traceback
+            traceback.print_exc()
+            results[model] = {
+                'error': str(e),
+                'model': model
+            }
+    return results
+
+
 class Evaluator:
     """Orchestrates the complete evaluation pipeline"""
     
@@ -26,36 +73,81 @@ class Evaluator:
         self.config = config
         self.dataset_manager = DatasetManager(config.data_root)
         
-        # Generate instance ID
-        self.instance_id = f"{datetime.now().strftime('%m%d%H%M')}{os.getpid()}"
+        # Generate instance ID (hex timestamp + pid: short and sortable)
+        self.instance_id = f"{int(time.time()):x}{os.getpid():x}"
         
         # Create log directory
         self.base_log_dir = config.log_root / f"outputs_{config.user_id}_{self.instance_id}"
         self.base_log_dir.mkdir(parents=True, exist_ok=True)
         
         self.overall_time_log = self.base_log_dir / "overall_evaluation_times.log"
+        self._overall_fh = None
+        self._open_logs()
+        
+        # Environment for evalscope child processes, built once
+        self._child_env = {**os.environ, 'PYTHONUNBUFFERED': '1'}
+        
+        # Serialize dataset configuration once for all evalscope invocations
+        self._dataset_args_json = json.dumps(config.dataset_args, separators=(',', ':'))
         
-        print("=" * 60)
-        print("Evaluation Instance Configuration:")
-        print("=" * 60)
-        print(f"USER_ID:      {config.user_id}")
-        print(f"INSTANCE_ID:  {self.instance_id}")
-        print(f"BASE_PORT:    {config.base_port}")
-        print(f"GPUS:         {config.gpus}")
-        print(f"TP_SIZE:      {config.tensor_parallel_size}")
-        print(f"DATA_ROOT:    {config.data_root}")
-        print(f"LOG_ROOT:     {config.log_root}")
-        print(f"BASE_LOG_DIR: {self.base_log_dir}")
-        print("=" * 60)
+        # Build the generation config once and keep a copy with the run's logs
+        self._gen_config = {
+            "do_sample": True,
+            "temperature": config.temperature,
+            "top_p": config.top_p,
+            "max_tokens": config.max_new_tokens,
+            "n": config.eval_n,
+            "seed": config.seed
+        }
+        self._gen_config_json = json.dumps(self._gen_config, separators=(',', ':'))
+        self._gen_config_path = self.base_log_dir / "generation_config.json"
+        self._gen_config_path.write_text(json.dumps(self._gen_config, indent=2))
+        
+        _emit(
+            _BANNER,
+            "Evaluation Instance Configuration:",
+            _BANNER,
+            f"USER_ID:      {config.user_id}",
+            f"INSTANCE_ID:  {self.instance_id}",
+            f"BASE_PORT:    {config.base_port}",
+            f"GPUS:         {config.gpus}",
+            f"TP_SIZE:      {config.tensor_parallel_size}",
+            f"DATA_ROOT:    {config.data_root}",
+            f"LOG_ROOT:     {config.log_root}",
+            f"BASE_LOG_DIR: {self.base_log_dir}",
+            _BANNER,
+        )
+    
+    def _open_logs(self):
+        """Open the overall time log once, line-buffered, for the whole run"""
+        if self._overall_fh is None:
+            self._overall_fh = open(self.overall_time_log, 'a', buffering=1)
+    
+    def close(self):
+        """Close log files held open by the evaluator"""
+        if self._overall_fh is not None:
+            self._overall_fh.close()
+            self._overall_fh = None
+    
+    def __getstate__(self):
+        """Drop open file handles when sent to a worker process"""
+        state = self.__dict__.copy()
+        state['_overall_fh'] = None
+        return state
+    
+    def __setstate__(self, state):
+        """Reopen log files in the worker process"""
+        self.__dict__.update(state)
+        self._open_logs()
     
     def prepare_datasets(self):
         """Download and verify datasets"""
-        print("\n" + "=" * 60)
-        print("Preparing datasets...")
-        print("=" * 60)
+        _emit("\n" + _BANNER, "Preparing datasets...", _BANNER)
         
         # Download datasets
-        self.dataset_manager.download_datasets(self.config.datasets)
+        self.dataset_manager.download_datasets(
+            self.config.datasets, force=self.config.force_redownload
+        )
         
         # Verify datasets
         verification = self.dataset_manager.verify_datasets(self.config.datasets)
@@ -65,118 +157,391 @@ class Evaluator:
         
         print("\n✓ All datasets ready")
     
-    def run_evaluation_for_model(self, model_ref: str) -> dict:
+    @staticmethod
+    def _dataset_timings(work_dir: Path, datasets: List[str], t0: float, t1: float) -> dict:
+        """Reconstruct per-dataset timing from evalscope output files
+        
+        evalscope evaluates the datasets of one invocation in turn, so each
+        dataset is taken to end at the newest mtime of its output files and
+        to start where the previously finished dataset ended.
+        
+        Args:
+            work_dir: evalscope work directory of the invocation
+            datasets: Datasets evaluated in the invocation
+            t0: Invocation start timestamp
+            t1: Invocation end timestamp
+            
+        Returns:
+            Dictionary mapping dataset to a (start, end) timestamp tuple
+        """
+        # One walk over the work dir; each file is stat'ed once and credited
+        # to the longest dataset name its file name starts with
+        by_length = sorted(datasets, key=len, reverse=True)
+        newest = {}
+        for root, _, files in os.walk(work_dir):
+            for filename in files:
+                dataset = next((d for d in by_length if filename.startswith(d)), None)
+                if dataset is None:
+                    continue
+                try:
+                    mtime = os.stat(os.path.join(root, filename)).st_mtime
+                except OSError:
+                    continue
+                if mtime >= t0 and mtime > newest.get(dataset, 0):
+                    newest[dataset] = mtime
+        end_times = {dataset: newest.get(dataset, t1) for dataset in datasets}
+        
+        timings = {}
+        start = t0
+        for dataset in sorted(datasets, key=end_times.get):
+            end = min(max(end_times[dataset], start), t1)
+            timings[dataset] = (start, end)
+            start = end
+        return timings
+    
+    def _run_evalscope_inprocess(self, served_model_name: str, port: int,
+                                 datasets: List[str], work_dir: Path) -> Optional[str]:
+        """Run evalscope through its Python API in the current process
+        
+        Returns:
+            Error message if the evaluation failed, None otherwise
+        """
+        from evalscope.config import TaskConfig
+        from evalscope.run import run_task
+        
+        # evalscope may mutate what it is given; hand it copies so one
+        # model's run can't leak into the next
+        task_config = TaskConfig(
+            model=served_model_name,
+            generation_config=copy.deepcopy(self._gen_config),
+            api_url=f'http://127.0.0.1:{port}/v1/chat/completions',
+            api_key='EMPTY',
+            eval_type='openai_api',
+            work_dir=str(work_dir),
+            datasets=datasets,
+            dataset_args=copy.deepcopy(self.config.dataset_args),
+            dataset_dir=str(self.config.data_root),
+            eval_batch_size=self.config.eval_batch_size,
+            stream=True,
+        )
+        print(f"Running evalscope in-process on: {' '.join(datasets)}")
+        try:
+            run_task(task_cfg=task_config)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return f"evalscope failed: {e}"
+        return None
+    
+    def _build_evalscope_cmd(self, served_model_name: str, port: int,
+                             datasets: List[str], work_dir: Path) -> List[str]:
+        """Build the `evalscope eval` command line"""
+        return [
+            'evalscope', 'eval',
+            '--model', served_model_name,
+            '--generation-config', self._gen_config_json,
+            '--api-url', f'http://127.0.0.1:{port}/v1/chat/completions',
+            '--api-key', 'EMPTY',
+            '--eval-type', 'openai_api',
+            '--work-dir', str(work_dir),
+            '--datasets', *datasets,
+            '--dataset-args', self._dataset_args_json,
+            '--dataset-dir', str(self.config.data_root),
+            '--eval-batch-size', str(self.config.eval_batch_size),
+            '--stream'
+        ]
+    
+    def _run_evalscope_subprocess(self, served_model_name: str, port: int,
+                                  datasets: List[str], work_dir: Path) -> Optional[str]:
+        """Run evalscope as a separate `evalscope eval` process
+        
+        Returns:
+            Error message if the evaluation failed, None otherwise
+        """
+        cmd = self._build_evalscope_cmd(served_model_name, port, datasets, work_dir)
+        
+        print(f"Running: {' '.join(cmd)}")
+        result = subprocess.run(cmd, stdin=subprocess.DEVNULL, env=self._child_env, check=False)
+        if result.returncode != 0:
+            return f"evalscope exited with code {result.returncode}"
+        return None
+    
+    def _run_evalscope_concurrent(self, served_model_name: str, port: int,
+                                  datasets: List[str], work_dir: Path, concurrency: int) -> dict:
+        """Run one evalscope client per dataset, several at a time
+        
+        The clients share one vLLM server, whose scheduler batches their
+        requests together. Each client logs to `<work_dir>/<dataset>/evalscope.log`.
+        
+        Returns:
+            Dictionary mapping dataset to its start/end timestamps, error and work_dir
+        """
+        def run_one(dataset: str) -> dict:
+            dataset_dir = work_dir / dataset
+            cmd = self._build_evalscope_cmd(served_model_name, port, [dataset], dataset_dir)
+            log_path = dataset_dir / "evalscope.log"
+            
+            print(f"Running: {' '.join(cmd)}\n  log: {log_path}")
+            start = time.time()
+            with open(log_path, 'w') as log_file:
+                process = subprocess.Popen(
+                    cmd, stdin=subprocess.DEVNULL, stdout=log_file,
+                    stderr=subprocess.STDOUT, env=self._child_env
+                )
+                returncode = process.wait()
+            
+            return {
+                'start': start,
+                'end': time.time(),
+                'error': f"evalscope exited with code {returncode}" if returncode != 0 else None,
+                'work_dir': str(dataset_dir),
+            }
+        
+        outcomes = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {executor.submit(run_one, dataset): dataset for dataset in datasets}
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
+        return {dataset: outcomes[dataset] for dataset in datasets}
+    
+    def run_evaluation_for_model(self, model_ref: str, warmup: Optional[tuple] = None) -> dict:
         """Run evaluation for a specific model
         
         Args:
             model_ref: Model path or HuggingFace repo ID
+            warmup: (VLLMService, Future) of a server already starting for
+                this model, as returned by `_start_warmup`
             
         Returns:
             Dictionary with evaluation results and timing info
         """
-        # Get model name for logging
-        name = Path(model_ref).name if VLLMService.is_local_path(model_ref) else model_ref
-        work_dir = self.base_log_dir / name
-        work_dir.mkdir(parents=True, exist_ok=True)
-        time_log = work_dir / "evaluation_times.log"
-        
-        results = {
-            'model': name,
-            'datasets': {},
-            'total_duration': 0
-        }
-        
-        # Start vLLM service
-        vllm_service = VLLMService(self.config)
+        # Take ownership of a warmed-up server first, so it is stopped even
+        # if setup below fails
+        vllm_service, ready = warmup if warmup is not None else (None, None)
         
         try:
-            port, served_model_name = vllm_service.start(model_ref, self.base_log_dir)
+            # Get model name for logging
+            name = Path(model_ref).name if VLLMService.is_local_path(model_ref) else model_ref
+            work_dir = self.base_log_dir / name
+            work_dir.mkdir(parents=True, exist_ok=True)
+            time_log = work_dir / "evaluation_times.log"
+            self._open_logs()
             
-            # Get dataset configuration
-            dataset_args = self.config.get_dataset_args()
-            dataset_args_json = json.dumps(dataset_args)
+            results = {
+                'model': name,
+                'datasets': {},
+                'total_duration': 0
+            }
             
-            # Iterate through datasets
-            for dataset in self.config.datasets:
-                dataset = dataset.strip()
-                t0 = time.time()
-                
-                print(f"\n[{name}] Starting evaluation for {dataset}")
-                
-                # Build evalscope command
-                gen_config = json.dumps({
-                    "do_sample": True,
-                    "temperature": self.config.temperature,
-                    "top_p": self.config.top_p,
-                    "max_tokens": self.config.max_new_tokens,
-                    "n": self.config.eval_n,
-                    "seed": self.config.seed
-                })
-                
-                cmd = [
-                    'evalscope', 'eval',
-                    '--model', served_model_name,
-                    '--generation-config', gen_config,
-                    '--api-url', f'http://127.0.0.1:{port}/v1/chat/completions',
-                    '--api-key', 'EMPTY',
-                    '--eval-type', 'openai_api',
-                    '--work-dir', str(work_dir / dataset),
-                    '--datasets', dataset,
-                    '--dataset-args', dataset_args_json,
-                    '--dataset-dir', str(self.config.data_root),
-                    '--eval-batch-size', str(self.config.eval_batch_size),
-                    '--stream'
-                ]
-                
-                # Execute evaluation
-                print(f"Running: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=False, text=True)
-                
+            if warmup is None:
+                vllm_service = VLLMService(self.config)
+                # Reuse a persistent server (see `--serve`) only when asked to
+                running = vllm_service.find_running(model_ref) if self.config.reuse_server else None
+                if running is not None:
+                    port, served_model_name = running
+                    print(f"✓ Reusing running vLLM server on port {port} ({served_model_name})")
+                    vllm_service = None
+            
+            if ready is not None:
+                port, served_model_name = ready.result()
+            elif vllm_service is not None:
+                port, served_model_name = vllm_service.start(model_ref, self.base_log_dir)
+            
+            datasets = [d.strip() for d in self.config.datasets]
+            
+            print(f"\n[{name}] Starting evaluation for {', '.join(datasets)}")
+            
+            # Several evalscope clients keep the server's batches fuller, as
+            # long as their combined batch size fits within max_num_seqs
+            concurrency = min(
+                len(datasets),
+                self.config.eval_concurrency,
+                math.ceil(self.config.max_num_seqs / self.config.eval_batch_size),
+            )
+            
+            t0 = time.time()
+            if concurrency > 1:
+                # Create every client's work dir up front rather than racing on mkdir
+                for dataset in datasets:
+                    (work_dir / dataset).mkdir(parents=True, exist_ok=True)
+                outcomes = self._run_evalscope_concurrent(
+                    served_model_name, port, datasets, work_dir, concurrency
+                )
+            else:
+                # All datasets go through one evalscope run against the
+                # long-lived vLLM server, so startup cost is paid once per model
+                if self.config.subprocess_eval:
+                    error = self._run_evalscope_subprocess(served_model_name, port, datasets, work_dir)
+                else:
+                    error = self._run_evalscope_inprocess(served_model_name, port, datasets, work_dir)
                 t1 = time.time()
-                dur = int(t1 - t0)
-                
-                print(f"[{name}] Completed {dataset}, duration={dur} seconds")
                 
-                # Store results
-                results['datasets'][dataset] = {
-                    'duration': dur,
-                    'start_time': datetime.fromtimestamp(t0).isoformat(),
-                    'end_time': datetime.fromtimestamp(t1).isoformat(),
-                    'work_dir': str(work_dir / dataset)
+                if error:
+                    timings = {dataset: (t0, t1) for dataset in datasets}
+                else:
+                    timings = self._dataset_timings(work_dir, datasets, t0, t1)
+                outcomes = {
+                    dataset: {'start': start, 'end': end, 'error': error, 'work_dir': str(work_dir)}
+                    for dataset, (start, end) in timings.items()
                 }
-                results['total_duration'] += dur
-                
-                # Log time
-                with open(time_log, 'a') as f:
-                    f.write(f"Model: {name}, Dataset: {dataset}, Duration: {dur}s, "
-                           f"Start: {datetime.fromtimestamp(t0)}, End: {datetime.fromtimestamp(t1)}\n")
-                
-                with open(self.overall_time_log, 'a') as f:
-                    f.write(f"[{self.config.user_id}] Model: {name}, Dataset: {dataset}, Duration: {dur}s\n")
-                
-                time.sleep(2)
+            
+            print(f"[{name}] Completed {len(datasets)} datasets, duration={int(time.time() - t0)} seconds")
+            
+            with open(time_log, 'a', buffering=1) as time_log_fh:
+                for dataset, outcome in outcomes.items():
+                    if outcome['error']:
+                        # Don't record a misleading duration for a failed run
+                        print(f"✗ [{name}] {dataset}: {outcome['error']}")
+                        results['datasets'][dataset] = {
+                            'error': outcome['error'],
+                            'work_dir': outcome['work_dir']
+                        }
+                        continue
+                    
+                    start, end = outcome['start'], outcome['end']
+                    dur = int(end - start)
+                    
+                    # Store results
+                    results['datasets'][dataset] = {
+                        'duration': dur,
+                        'start_time': datetime.fromtimestamp(start).isoformat(),
+                        'end_time': datetime.fromtimestamp(end).isoformat(),
+                        'work_dir': outcome['work_dir']
+                    }
+                    results['total_duration'] += dur
+                    
+                    # Log time
+                    time_log_fh.write(f"Model: {name}, Dataset: {dataset}, Duration: {dur}s, "
+                                      f"Start: {datetime.fromtimestamp(start)}, End: {datetime.fromtimestamp(end)}\n")
+                    self._overall_fh.write(f"[{self.config.user_id}] Model: {name}, Dataset: {dataset}, Duration: {dur}s\n")
         
         finally:
             # Clean up vLLM service
+            if vllm_service is not None:
+                vllm_service.stop()
+        
+        return results
+    
+    def _start_warmup(self, model_ref: str) -> Optional[tuple]:
+        """Start loading a model's vLLM server in the background
+        
+        Args:
+            model_ref: Model path or HuggingFace repo ID
+            
+        Returns:
+            (VLLMService, Future) of the starting server, or None if a running
+            server will be reused or the launch failed
+        """
+        vllm_service = VLLMService(self.config)
+        if self.config.reuse_server and vllm_service.find_running(model_ref) is not None:
+            return None
+        try:
+            return vllm_service, vllm_service.start_async(model_ref, self.base_log_dir)
+        except Exception as e:
+            print(f"⚠ Could not start vLLM early for {model_ref}: {e}")
             vllm_service.stop()
+            return None
+    
+    def run_sequential(self, warmup: Optional[tuple] = None) -> dict:
+        """Evaluate models one after another on all configured GPUs
         
+        Args:
+            warmup: Server already starting for the first model (see `_start_warmup`)
+            
+        Returns:
+            Dictionary mapping model to its evaluation results
+        """
+        results = {}
+        for idx, model in enumerate(self.config.models):
+            _emit(
+                "\n" + _BANNER,
+                f"Evaluating model {idx+1}/{len(self.config.models)}: {model}",
+                _BANNER + "\n",
+            )
+            
+            try:
+                results[model] = self.run_evaluation_for_model(model, warmup if idx == 0 else None)
+            except Exception as e:
+                print(f"Error: Model {model} evaluation failed: {e}")
+                import traceback
+                traceback.print_exc()
+                results[model] = {
+                    'error': str(e),
+                    'model': model
+                }
         return results
     
+    def run_parallel_replicas(self, shards: List[str]) -> dict:
+        """Evaluate models concurrently, one vLLM replica per GPU shard
+        
+        Models are distributed round-robin over the shards; each shard runs
+        in its own worker process and evaluates its models sequentially.
+        
+        Args:
+            shards: Comma-separated GPU ID strings, one per replica
+            
+        Returns:
+            Dictionary mapping model to its evaluation results
+        """
+        models = self.config.models
+        shards = shards[:len(models)]
+        model_groups = [models[i::len(shards)] for i in range(len(shards))]
+        
+        print(f"\nRunning {len(shards)} parallel replicas on GPU shards: {shards}")
+        
+        results = {}
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = {
+                executor.submit(_run_replica, self, group, gpus, idx): group
+                for idx, (group, gpus) in enumerate(zip(model_groups, shards))
+            }
+            for future in as_completed(futures):
+                try:
+                    results.update(future.result())
+                except Exception as e:
+                    print(f"Error: Replica for models {futures[future]} failed: {e}")
+                    for model in futures[future]:
+                        results[model] = {
+                            'error': str(e),
+                            'model': model
+                        }
+        
+        # Preserve the configured model order in the summary
+        return {model: results[model] for model in models if model in results}
+    
     def run(self) -> dict:
         """Run complete evaluation pipeline
         
         Returns:
             Dictionary with all evaluation results
         """
-        print("\n" + "=" * 60)
-        print("Starting Evaluation Pipeline")
-        print("=" * 60)
-        print(f"Models: {self.config.models}")
-        print(f"Datasets: {self.config.datasets}")
-        print("=" * 60)
+        _emit(
+            "\n" + _BANNER,
+            "Starting Evaluation Pipeline",
+            _BANNER,
+            f"Models: {self.config.models}",
+            f"Datasets: {self.config.datasets}",
+            _BANNER,
+        )
+        
+        self._open_logs()
+        
+        shards = self.config.get_gpu_shards()
+        parallel = (self.config.parallel_replicas and len(shards) > 1
+                    and len(self.config.models) > 1)
+        
+        # Load the first model while datasets are prepared
+        warmup = None
+        if self.config.models and not parallel:
+            warmup = self._start_warmup(self.config.models[0])
         
         # Prepare datasets
-        self.prepare_datasets()
+        try:
+            self.prepare_datasets()
+        except BaseException:
+            if warmup is not None:
+                warmup[0].stop()
+            raise
         
         # Run evaluation for each model
         all_results = {
@@ -186,57 +551,65 @@ class Evaluator:
             'log_dir': str(self.base_log_dir)
         }
         
-        for idx, model in enumerate(self.config.models):
-            print(f"\n{'='*60}")
-            print(f"Evaluating model {idx+1}/{len(self.config.models)}: {model}")
-            print(f"{'='*60}\n")
-            
-            try:
-                results = self.run_evaluation_for_model(model)
-                all_results['models'][model] = results
-            except Exception as e:
-                print(f"Error: Model {model} evaluation failed: {e}")
-                import traceback
-                traceback.print_exc()
-                all_results['models'][model] = {
-                    'error': str(e),
-                    'model': model
-                }
+        if parallel:
+            all_results['models'] = self.run_parallel_replicas(shards)
+        else:
+            all_results['models'] = self.run_sequential(warmup)
         
         # Save summary
         summary_file = self.base_log_dir / "evaluation_summary.json"
         with open(summary_file, 'w') as f:
             json.dump(all_results, f, indent=2)
+        self.close()
         
-        print(f"\n{'='*60}")
-        print("Evaluation Pipeline Completed!")
-        print(f"{'='*60}")
-        print(f"Results saved to: {self.base_log_dir}")
-        print(f"Summary: {summary_file}")
-        print(f"Overall log: {self.overall_time_log}")
+        _emit(
+            "\n" + _BANNER,
+            "Evaluation Pipeline Completed!",
+            _BANNER,
+            f"Results saved to: {self.base_log_dir}",
+            f"Summary: {summary_file}",
+            f"Overall log: {self.overall_time_log}",
+        )
         
         return all_results
     
     def show_results(self):
         """Display evaluation results"""
-        if self.overall_time_log.exists():
-            print("=" * 60)
-            print("Overall Evaluation Time Statistics:")
-            print("=" * 60)
+        # The log is created empty at init, so only its contents count
+        if self.overall_time_log.exists() and self.overall_time_log.stat().st_size > 0:
+            _emit(_BANNER, "Overall Evaluation Time Statistics:", _BANNER)
             with open(self.overall_time_log) as f:
                 print(f.read())
         else:
             print("No evaluation logs generated yet")
         
         # Show directory structure
-        print("\nEvaluation Result Directory Structure:")
-        print("=" * 60)
+        _emit("\nEvaluation Result Directory Structure:", _BANNER)
         
         if self.base_log_dir.exists():
-            for root, dirs, files in os.walk(self.base_log_dir):
-                level = root.replace(str(self.base_log_dir), '').count(os.sep)
-                indent = ' ' * 2 * level
-                print(f'{indent}{os.path.basename(root)}/')
-                subindent = ' ' * 2 * (level + 1)
-                for file in files:
-                    print(f'{subindent}{file}')
+            print(f'{self.base_log_dir.name}/')
+            self._print_tree(self.base_log_dir, level=1)
+    
+    def _print_tree(self, path: Path, level: int, max_depth: int = 3, max_entries: int = 50):
+        """Print a directory tree without stat-ing every file
+        
+        Args:
+            path: Directory to print
+            level: Indentation level of the directory's entries
+            max_depth: Deepest level whose directories are expanded
+            max_entries: Maximum entries shown per directory
+        """
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        
+        indent = ' ' * 2 * level
+        for entry in entries[:max_entries]:
+            if entry.is_dir(follow_symlinks=False):
+                print(f'{indent}{entry.name}/')
+                if level < max_depth:
+                    self._print_tree(Path(entry.path), level + 1, max_depth, max_entries)
+            else:
+                print(f'{indent}{entry.name}')
+        
+        if len(entries) > max_entries:
+            print(f'{indent}... ({len(entries) - max_entries} files omitted)')
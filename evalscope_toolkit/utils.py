@@ -1,24 +1,118 @@
-"""Utility functions for notebook setup and dependency management"""
+"""Utility functions for notebook setup and dependency management
+
+Presence checks go through `check_dependency`, which uses `find_spec` and
+never executes the package. Install decisions in `setup_dependencies` use
+`is_installed`, which answers from one cached scan of installed
+distributions. Heavy packages (torch, vllm, evalscope,
+modelscope) are only imported at run time, where they are actually used.
+"""
 
 import sys
+import glob
+import functools
+import importlib
 import subprocess
 import importlib.util
+import importlib.metadata
+from typing import List, Optional
+
+
+# evalscope and the packages it needs at runtime, in install order
+EVALSCOPE_DEPS = ['requests', 'tqdm', 'fsspec', 'dill', 'multiprocess', 'datasets', 'modelscope', 'evalscope']
+
+
+@functools.lru_cache(maxsize=None)
+def _find(package_name: str) -> bool:
+    """Look up a package's import spec (cached per package name)"""
+    try:
+        return importlib.util.find_spec(package_name) is not None
+    except (ImportError, ValueError):
+        return False
 
 
 def check_dependency(package_name: str) -> bool:
     """Check if a package is installed
     
+    Results are cached; call `clear_dependency_cache()` after
+    installing packages so they are probed again.
+    
     Args:
         package_name: Name of the package to check
         
     Returns:
         True if installed, False otherwise
     """
-    try:
-        spec = importlib.util.find_spec(package_name)
-        return spec is not None
-    except:
+    return _find(package_name)
+
+
+def _normalize_dist_name(name: str) -> str:
+    """Normalize a distribution name for comparison (PEP 503 style)"""
+    return name.lower().replace('_', '-').replace('.', '-')
+
+
+@functools.lru_cache(maxsize=1)
+def _installed_dists() -> frozenset:
+    """Names of all installed distributions (scanned once, then cached)"""
+    names = set()
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            names.add(_normalize_dist_name(name))
+    return frozenset(names)
+
+
+def is_installed(name: str) -> bool:
+    """Check if a distribution is installed, without importing it
+    
+    Args:
+        name: Distribution name as passed to pip (e.g. 'vllm')
+        
+    Returns:
+        True if installed, False otherwise
+    """
+    return _normalize_dist_name(name) in _installed_dists()
+
+
+def clear_dependency_cache():
+    """Forget cached lookups so newly installed packages are found
+    
+    Clears both the `check_dependency` import-spec cache and the
+    `is_installed` distribution cache.
+    """
+    importlib.invalidate_caches()
+    _find.cache_clear()
+    _installed_dists.cache_clear()
+
+
+def _pip_install(label: str, install_names: List[str], upgrade: bool) -> bool:
+    """Run one pip install, showing pip's output only if it fails
+    
+    Args:
+        label: Name(s) to report in progress messages
+        install_names: Names to pass to pip install
+        upgrade: Whether to upgrade if already installed
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    print(f"Installing {label}...")
+    cmd = [sys.executable, '-m', 'pip', 'install']
+    if upgrade:
+        cmd.append('--upgrade')
+    cmd.extend(install_names)
+    
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"✗ Failed to install {label} (pip exit code {result.returncode})")
+        if result.stdout:
+            print(result.stdout)
+        if result.stderr:
+            print(result.stderr)
         return False
+    
+    clear_dependency_cache()
+    print(f"✓ {label} installed successfully")
+    return True
 
 
 def install_package(package_name: str, install_name: str = None, upgrade: bool = False) -> bool:
@@ -34,32 +128,62 @@ def install_package(package_name: str, install_name: str = None, upgrade: bool =
     """
     if install_name is None:
         install_name = package_name
+    return _pip_install(package_name, [install_name], upgrade)
+
+
+def install_packages(package_names: List[str], upgrade: bool = False) -> bool:
+    """Install several packages with a single pip invocation
     
-    print(f"Installing {package_name}...")
-    try:
-        cmd = [sys.executable, '-m', 'pip', 'install']
-        if upgrade:
-            cmd.append('--upgrade')
-        cmd.append(install_name)
-        subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
-        print(f"✓ {package_name} installed successfully")
+    Args:
+        package_names: Names to pass to pip install
+        upgrade: Whether to upgrade if already installed
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    if not package_names:
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Failed to install {package_name}: {e}")
-        return False
+    return _pip_install(', '.join(package_names), package_names, upgrade)
 
 
+def _has_nvidia_pci() -> Optional[bool]:
+    """Look for an NVIDIA device (PCI vendor 0x10de) in sysfs
+    
+    Returns:
+        True/False if sysfs PCI info is available, None otherwise
+    """
+    vendor_files = glob.glob('/sys/bus/pci/devices/*/vendor')
+    if not vendor_files:
+        return None
+    
+    for vendor_file in vendor_files:
+        try:
+            with open(vendor_file) as f:
+                if f.read().strip().lower() == '0x10de':
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+@functools.lru_cache(maxsize=1)
 def check_gpu_availability() -> bool:
-    """Check GPU availability
+    """Check GPU availability (probed once per process)
     
     Returns:
         True if GPU is available, False otherwise
     """
+    # Without NVIDIA hardware there is no need to fork nvidia-smi
+    if _has_nvidia_pci() is False:
+        print("⚠ No NVIDIA GPU detected - vLLM will use CPU mode")
+        return False
+    
     try:
-        subprocess.run(['nvidia-smi'], capture_output=True, check=True)
+        # A hung driver can make nvidia-smi block for a long time
+        subprocess.run(['nvidia-smi'], capture_output=True, check=True, timeout=3)
         print("✓ NVIDIA GPU detected")
         return True
-    except:
+    except (OSError, subprocess.SubprocessError):
         print("⚠ No NVIDIA GPU detected - vLLM will use CPU mode")
         return False
 
@@ -74,6 +198,21 @@ def install_vllm() -> bool:
     return install_package("vllm")
 
 
+def _install_missing(package_names: List[str]) -> bool:
+    """Install packages in one pip run, retrying one by one on failure
+    
+    Args:
+        package_names: Names of missing packages
+        
+    Returns:
+        True if all packages installed successfully
+    """
+    if install_packages(package_names):
+        return True
+    # A single bad package shouldn't block the rest
+    return all([install_package(name) for name in package_names])
+
+
 def install_evalscope() -> bool:
     """Install evalscope with dependencies
     
@@ -81,19 +220,8 @@ def install_evalscope() -> bool:
         True if successful, False otherwise
     """
     print("Installing evalscope...")
-    
-    # Install core dependencies first
-    core_deps = ['requests', 'tqdm', 'fsspec', 'dill', 'multiprocess', 'datasets']
-    for dep in core_deps:
-        if not check_dependency(dep):
-            install_package(dep)
-    
-    # Install modelscope
-    if not check_dependency('modelscope'):
-        install_package('modelscope')
-    
-    # Install evalscope
-    return install_package('evalscope')
+    missing = [dep for dep in EVALSCOPE_DEPS if not is_installed(dep)]
+    return _install_missing(missing)
 
 
 def setup_dependencies() -> bool:
@@ -109,28 +237,21 @@ def setup_dependencies() -> bool:
     # Check GPU
     check_gpu_availability()
     
-    # Check and install torch
-    if not check_dependency('torch'):
-        print("Installing PyTorch...")
-        install_package('torch')
-    else:
-        print("✓ torch already installed")
+    # Collect everything missing so it installs in a single pip run
+    missing = []
+    for package in ('torch', 'vllm'):
+        if is_installed(package):
+            print(f"✓ {package} already installed")
+        else:
+            missing.append(package)
     
-    # Install vLLM
-    if not check_dependency('vllm'):
-        if not install_vllm():
-            print("⚠ Failed to install vLLM")
-            return False
+    if is_installed('evalscope'):
+        print("✓ evalscope already installed")
     else:
-        print("✓ vLLM already installed")
+        missing.extend(dep for dep in EVALSCOPE_DEPS if not is_installed(dep))
     
-    # Install evalscope
-    if not check_dependency('evalscope'):
-        if not install_evalscope():
-            print("⚠ Failed to install evalscope")
-            return False
-    else:
-        print("✓ evalscope already installed")
+    if missing and not _install_missing(missing):
+        print("⚠ Failed to install some dependencies")
     
     # Verify critical packages
     print("\nVerifying installations...")
@@ -138,7 +259,7 @@ def setup_dependencies() -> bool:
     all_ok = True
     
     for package in critical_packages:
-        if check_dependency(package):
+        if is_installed(package):
             print(f"✓ {package}: installed")
         else:
             print(f"✗ {package}: not available")
@@ -156,6 +277,28 @@ def setup_dependencies() -> bool:
     return all_ok
 
 
+def _move_dir(src: str, dst: str) -> None:
+    """Move a directory, renaming in place when src and dst share a filesystem
+    
+    Args:
+        src: Directory to move
+        dst: Destination path (must not exist)
+    """
+    import os
+    import errno
+    import shutil
+    
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        # Only a cross-device move needs an explicit copy; anything else
+        # (existing destination, permissions) would just fail again
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copytree(src, dst)
+        shutil.rmtree(src)
+
+
 def download_toolkit_from_github(repo_url: str = None, branch: str = "main") -> bool:
     """Download evalscope_toolkit from GitHub repository
     
@@ -166,11 +309,10 @@ def download_toolkit_from_github(repo_url: str = None, branch: str = "main") ->
     Returns:
         True if successful, False otherwise
     """
-    from pathlib import Path
+    import os
     
     # Check if toolkit already exists
-    toolkit_path = Path.cwd() / "evalscope_toolkit"
-    if toolkit_path.exists():
+    if os.path.isdir("evalscope_toolkit"):
         print("✓ evalscope_toolkit already exists")
         return True
     
@@ -182,16 +324,32 @@ def download_toolkit_from_github(repo_url: str = None, branch: str = "main") ->
     
     # Use git to clone or download
     try:
-        # Try git clone first
-        subprocess.run(
-            ['git', 'clone', '-b', branch, '--depth', '1', repo_url, 'temp_repo'],
-            check=True,
-            capture_output=True
-        )
+        import shutil
+        
+        # Try a sparse git clone first, fetching only evalscope_toolkit/
+        try:
+            subprocess.run(
+                ['git', 'clone', '--filter=blob:none', '--depth', '1', '--sparse',
+                 '-b', branch, repo_url, 'temp_repo'],
+                check=True,
+                capture_output=True
+            )
+            subprocess.run(
+                ['git', '-C', 'temp_repo', 'sparse-checkout', 'set', 'evalscope_toolkit'],
+                check=True,
+                capture_output=True
+            )
+        except subprocess.CalledProcessError:
+            # git < 2.25 has no sparse-checkout; fall back to a full shallow clone
+            shutil.rmtree('temp_repo', ignore_errors=True)
+            subprocess.run(
+                ['git', 'clone', '--depth', '1', '-b', branch, repo_url, 'temp_repo'],
+                check=True,
+                capture_output=True
+            )
         
         # Move evalscope_toolkit to current directory
-        import shutil
-        shutil.move('temp_repo/evalscope_toolkit', 'evalscope_toolkit')
+        _move_dir('temp_repo/evalscope_toolkit', 'evalscope_toolkit')
         shutil.rmtree('temp_repo')
         
         print("✓ evalscope_toolkit downloaded successfully")
@@ -200,40 +358,39 @@ def download_toolkit_from_github(repo_url: str = None, branch: str = "main") ->
     except subprocess.CalledProcessError:
         print("⚠ Git clone failed, trying alternative method...")
         
-        # Try wget/curl download
+        # Download the archive into memory and extract only the package
         try:
+            import io
             import urllib.request
             import zipfile
             
-            # Download zip file
             zip_url = f"{repo_url}/archive/refs/heads/{branch}.zip"
             print(f"Downloading {zip_url}...")
             
-            urllib.request.urlretrieve(zip_url, "temp.zip")
-            
-            # Extract
-            with zipfile.ZipFile("temp.zip", 'r') as zip_ref:
-                zip_ref.extractall("temp_extract")
+            with urllib.request.urlopen(zip_url) as response:
+                data = response.read()
             
-            # Move evalscope_toolkit
-            import shutil
-            import os
+            extracted = False
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                for member in zf.infolist():
+                    # Archive entries look like "<repo>-<branch>/evalscope_toolkit/..."
+                    _, _, rel_path = member.filename.partition('/')
+                    parts = rel_path.split('/')
+                    if parts[0] != "evalscope_toolkit" or '..' in parts:
+                        continue
+                    
+                    if member.is_dir():
+                        os.makedirs(rel_path, exist_ok=True)
+                        continue
+                    
+                    os.makedirs(os.path.dirname(rel_path), exist_ok=True)
+                    with zf.open(member) as src, open(rel_path, 'wb') as dst:
+                        dst.write(src.read())
+                    extracted = True
             
-            # Find the extracted directory
-            extracted_dir = None
-            for item in os.listdir("temp_extract"):
-                if os.path.isdir(os.path.join("temp_extract", item)):
-                    extracted_dir = os.path.join("temp_extract", item)
-                    break
-            
-            if extracted_dir:
-                toolkit_src = os.path.join(extracted_dir, "evalscope_toolkit")
-                if os.path.exists(toolkit_src):
-                    shutil.move(toolkit_src, "evalscope_toolkit")
-                    shutil.rmtree("temp_extract")
-                    os.remove("temp.zip")
-                    print("✓ evalscope_toolkit downloaded successfully")
-                    return True
+            if extracted:
+                print("✓ evalscope_toolkit downloaded successfully")
+                return True
             
             print("⚠ Could not find evalscope_toolkit in downloaded archive")
             return False
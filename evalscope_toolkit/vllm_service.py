@@ -1,16 +1,27 @@
-"""vLLM service management"""
+"""vLLM service management
+
+`requests` and `signal` are imported inside the methods that use them, so
+importing the toolkit stays cheap for callers that never start a server.
+"""
 
 import os
 import sys
+import atexit
 import time
 import socket
-import signal
-import random
-import hashlib
+import threading
+import secrets
+import functools
 import subprocess
-import requests
 from pathlib import Path
-from typing import Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import List, Optional, Tuple
+
+
+def _is_local_path(path: str) -> bool:
+    """Check if path is a local directory"""
+    return os.path.exists(path)
 
 
 class VLLMService:
@@ -23,9 +34,11 @@ class VLLMService:
             config: EvalConfig instance
         """
         self.config = config
+        self._base_env = dict(os.environ)
         self.process = None
         self.port = None
         self.served_model_name = None
+        self._stopping = False
     
     @staticmethod
     def is_port_in_use(port: int) -> bool:
@@ -34,62 +47,127 @@ class VLLMService:
             return s.connect_ex(('127.0.0.1', port)) == 0
     
     @staticmethod
-    def pick_free_port(base_port: int) -> int:
-        """Pick a free port starting from base_port"""
-        port = base_port + random.randint(0, 100)
-        max_attempts = 100
+    def pick_free_ports(n: int) -> List[int]:
+        """Pick n distinct free ports assigned by the kernel
         
-        for _ in range(max_attempts):
-            if not VLLMService.is_port_in_use(port):
-                try:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                        s.bind(('127.0.0.1', port))
-                        return port
-                except OSError:
-                    pass
-            port += 1
-            if port > 65535:
-                port = 20000 + random.randint(0, 10000)
+        All sockets stay bound until every port is chosen, so the same
+        port can't be handed out twice. Kernel-assigned ports make it
+        unlikely that concurrent runs pick the same port while their
+        servers are still loading and have not bound it yet.
         
-        raise RuntimeError(f"Could not find available port (starting from {base_port})")
+        Args:
+            n: Number of ports
+            
+        Returns:
+            List of free port numbers
+        """
+        sockets = []
+        try:
+            for _ in range(n):
+                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sockets.append(s)
+                s.bind(('127.0.0.1', 0))
+            return [s.getsockname()[1] for s in sockets]
+        finally:
+            for s in sockets:
+                s.close()
     
     @staticmethod
-    def is_local_path(path: str) -> bool:
-        """Check if path is a local directory"""
-        return Path(path).exists()
+    def pick_free_port() -> int:
+        """Pick a free port assigned by the kernel
+        
+        Returns:
+            Free port number
+        """
+        return VLLMService.pick_free_ports(1)[0]
+    
+    is_local_path = staticmethod(functools.lru_cache(maxsize=1024)(_is_local_path))
+    
+    def get_served_model_name(self, model_ref: str) -> str:
+        """Get the name a model is served under for the configured user"""
+        served_name = Path(model_ref).name if self.is_local_path(model_ref) else model_ref
+        return f"{served_name}_{self.config.user_id}"
+    
+    def find_running(self, model_ref: str) -> Optional[Tuple[int, str]]:
+        """Look for an already running vLLM server serving a model on base_port
+        
+        Args:
+            model_ref: Model path or HuggingFace repo ID
+            
+        Returns:
+            Tuple of (port, served_model_name) if found, None otherwise
+        """
+        import requests
+        
+        port = self.config.base_port
+        served_model_name = self.get_served_model_name(model_ref)
+        try:
+            resp = requests.get(f"http://127.0.0.1:{port}/v1/models", timeout=1)
+            if resp.status_code != 200:
+                return None
+            served = {m.get('id') for m in resp.json().get('data', [])}
+        except Exception:
+            return None
+        
+        if served_model_name in served:
+            return port, served_model_name
+        return None
     
-    def start(self, model_ref: str, log_dir: Path) -> Tuple[int, str]:
-        """Start vLLM service for a model
+    def start(self, model_ref: str, log_dir: Path, port: Optional[int] = None) -> Tuple[int, str]:
+        """Start vLLM service for a model and wait until it is ready
         
         Args:
             model_ref: Model path or HuggingFace repo ID
             log_dir: Directory for logs
+            port: Port to serve on (default: a kernel-assigned free port)
             
         Returns:
             Tuple of (port, served_model_name)
         """
+        return self.start_async(model_ref, log_dir, port).result()
+    
+    def start_async(self, model_ref: str, log_dir: Path, port: Optional[int] = None) -> Future:
+        """Launch vLLM service for a model without waiting for it
+        
+        The process is spawned immediately; readiness is polled on a
+        background thread, so callers can do other work (e.g. prepare
+        datasets) while the model loads.
+        
+        Args:
+            model_ref: Model path or HuggingFace repo ID
+            log_dir: Directory for logs
+            port: Port to serve on (default: a kernel-assigned free port)
+            
+        Returns:
+            Future resolving to (port, served_model_name)
+        """
+        self._stopping = False
+        
         # Generate served model name
-        served_name = Path(model_ref).name if self.is_local_path(model_ref) else model_ref
-        self.served_model_name = f"{served_name}_{self.config.user_id}"
+        self.served_model_name = self.get_served_model_name(model_ref)
         
-        # Pick a free port
-        self.port = self.pick_free_port(self.config.base_port)
+        # Pick the service port and MASTER_PORT in one round; a port is
+        # pinned only when the caller asks for one (e.g. `--serve`)
+        if port is None:
+            self.port, master_port = self.pick_free_ports(2)
+        else:
+            self.port, master_port = port, self.pick_free_port()
         
         # Generate unique identifier
-        model_hash = hashlib.md5(
-            f"{served_name}_{self.config.user_id}_{os.getpid()}".encode()
-        ).hexdigest()[:8]
+        model_hash = secrets.token_hex(4)
         run_tmp = Path(f"/tmp/vllm_{self.config.user_id}_{model_hash}_{os.getpid()}")
         run_tmp.mkdir(parents=True, exist_ok=True)
         
-        # Set environment variables
-        env = os.environ.copy()
-        env['TMPDIR'] = str(run_tmp)
-        env['XDG_RUNTIME_DIR'] = str(run_tmp)
-        env['VLLM_INSTANCE_ID'] = f"eval_{self.config.user_id}_{model_hash}_{os.getpid()}"
-        env['MASTER_ADDR'] = '127.0.0.1'
-        env['MASTER_PORT'] = str(self.pick_free_port(20000))
-        env['CUDA_VISIBLE_DEVICES'] = self.config.gpus
+        # Overlay per-run variables on the environment captured at init
+        env = {
+            **self._base_env,
+            'TMPDIR': str(run_tmp),
+            'XDG_RUNTIME_DIR': str(run_tmp),
+            'VLLM_INSTANCE_ID': f"eval_{self.config.user_id}_{model_hash}_{os.getpid()}",
+            'MASTER_ADDR': '127.0.0.1',
+            'MASTER_PORT': str(master_port),
+            'CUDA_VISIBLE_DEVICES': self.config.gpus,
+        }
         
         vllm_log = log_dir / f"vllm_{model_hash}.log"
         print(f"Starting vLLM {model_ref} on port {self.port} (MASTER_PORT={env['MASTER_PORT']})")
@@ -106,74 +184,179 @@ class VLLMService:
             '--tensor-parallel-size', str(self.config.tensor_parallel_size),
             '--gpu-memory-utilization', str(self.config.gpu_memory_utilization),
             '--max-num-seqs', str(self.config.max_num_seqs),
+            '--max-num-batched-tokens', str(self.config.max_num_batched_tokens),
             '--disable-log-requests',
             '--disable-log-stats',
         ]
         
+        # Older vLLM releases do not know this flag, so only pass it when needed
+        if self.config.data_parallel_size > 1:
+            cmd.extend(['--data-parallel-size', str(self.config.data_parallel_size)])
+        
+        # Scheduler and KV cache optimizations
+        if self.config.async_scheduling:
+            cmd.append('--async-scheduling')
+        if self.config.enable_prefix_caching:
+            cmd.append('--enable-prefix-caching')
+        if self.config.enable_chunked_prefill:
+            cmd.append('--enable-chunked-prefill')
+        
         # Add chat template if exists
-        if self.config.chat_template and self.config.chat_template.exists():
+        if self.config.chat_template and os.path.exists(self.config.chat_template):
             cmd.extend(['--chat-template', str(self.config.chat_template)])
         
-        # Check if model is accessible
-        print(f"Checking model accessibility: {model_ref}")
+        # Check model accessibility in the background; the result is only
+        # advisory, so it must not delay the (much longer) vLLM startup
+        access_check = None
         if not self.is_local_path(model_ref):
-            # Try HF mirror first, then original HF
-            endpoints = [
-                ("https://hf-mirror.com", "HF Mirror"),
-                ("https://huggingface.co", "HuggingFace")
-            ]
-            
-            for endpoint, name in endpoints:
-                try:
-                    response = requests.head(f"{endpoint}/{model_ref}", timeout=5)
-                    if response.status_code == 200:
-                        print(f"✓ {name} model accessible: {model_ref}")
-                        break
-                    else:
-                        print(f"⚠ {name} returned status {response.status_code}")
-                except Exception as e:
-                    print(f"⚠ Could not check {name}: {type(e).__name__}")
-                    continue
-            else:
-                print(f"⚠ Model accessibility check failed, but will continue anyway")
+            executor = ThreadPoolExecutor(max_workers=1)
+            access_check = executor.submit(self._check_model_access, model_ref)
+            executor.shutdown(wait=False)
         
         # Start process
         with open(vllm_log, 'w') as log_file:
+            # Own session/process group so stop() can reach vLLM's workers too
             self.process = subprocess.Popen(
-                cmd, env=env, stdout=log_file, stderr=subprocess.STDOUT
+                cmd, env=env, stdout=log_file, stderr=subprocess.STDOUT,
+                start_new_session=True
             )
+        # The server no longer dies with our process group, so stop it
+        # when the interpreter exits
+        atexit.register(self.stop)
+        
+        if access_check is not None:
+            print(f"Checking model accessibility: {model_ref}")
+            try:
+                print('\n'.join(access_check.result(timeout=1)))
+            except FuturesTimeoutError:
+                print("⚠ Model accessibility check still running, continuing without it")
         
         print(f"vLLM PID={self.process.pid}, log={vllm_log}")
         
-        # Wait for service to be ready (no timeout - wait until success or process dies)
-        print(f"Waiting for vLLM to be ready...")
+        # Poll on a daemon thread: executor threads are joined before atexit
+        # handlers run, so a server stuck loading would hang interpreter exit
+        # and keep the atexit stop() from ever firing
+        ready = Future()
+        process = self.process
+        
+        def poll():
+            if not ready.set_running_or_notify_cancel():
+                return
+            try:
+                ready.set_result(self._wait_ready(process, vllm_log))
+            except BaseException as e:
+                ready.set_exception(e)
         
-        start_time = time.time()
-        check_interval = 2
+        threading.Thread(target=poll, name=f"vllm-ready-{process.pid}", daemon=True).start()
+        return ready
+    
+    def _wait_ready(self, process: subprocess.Popen, vllm_log: Path) -> Tuple[int, str]:
+        """Block until the vLLM server answers its health check
         
-        while True:
-            elapsed = int(time.time() - start_time)
+        Args:
+            process: vLLM server process
+            vllm_log: Log file of the server
             
-            # Check if process died
-            if self.process.poll() is not None:
-                print(f"\n✗ vLLM process died (exit code: {self.process.returncode})")
-                self._show_log_tail(vllm_log)
-                raise RuntimeError(f"vLLM failed to start (exit code: {self.process.returncode})")
+        Returns:
+            Tuple of (port, served_model_name)
+        """
+        import requests
+        
+        # Wait for service to be ready (no timeout - wait until success or process dies).
+        # Poll quickly at first and back off, reusing one pooled connection.
+        print(f"Waiting for vLLM to be ready...")
+        port, served_model_name = self.port, self.served_model_name
+        
+        start_time = time.monotonic()
+        next_report = start_time + 30
+        delay = 0.1
+        health_url = f"http://127.0.0.1:{port}/health"
+        
+        with requests.Session() as session, open(vllm_log, errors='replace') as log_reader:
+            partial_line = ''
+            while True:
+                # Surface errors from the log as they appear, reading only what
+                # was appended since the last iteration
+                partial_line = self._report_log_errors(log_reader, partial_line)
+                
+                # Check if process died
+                if process.poll() is not None:
+                    if self._stopping:
+                        raise RuntimeError("vLLM service was stopped before it became ready")
+                    print(f"\n✗ vLLM process died (exit code: {process.returncode})")
+                    self._show_log_tail(vllm_log)
+                    raise RuntimeError(f"vLLM failed to start (exit code: {process.returncode})")
+                
+                # Check health endpoint
+                try:
+                    resp = session.get(health_url, timeout=1)
+                    if resp.status_code == 200:
+                        print(f"✓ vLLM ready (took {int(time.monotonic() - start_time)}s)")
+                        return port, served_model_name
+                except requests.RequestException:
+                    pass
+                
+                # Show progress every 30s
+                now = time.monotonic()
+                if now >= next_report:
+                    print(f"  Still waiting... {int(now - start_time)}s elapsed")
+                    next_report += 30
+                
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+    
+    @staticmethod
+    def _check_model_access(model_ref: str) -> List[str]:
+        """Probe model hubs for a remote model
+        
+        Args:
+            model_ref: HuggingFace repo ID
             
-            # Check health endpoint
+        Returns:
+            Report lines describing the outcome
+        """
+        import requests
+        
+        # Try HF mirror first, then original HF
+        endpoints = [
+            ("https://hf-mirror.com", "HF Mirror"),
+            ("https://huggingface.co", "HuggingFace")
+        ]
+        
+        report = []
+        for endpoint, name in endpoints:
             try:
-                resp = requests.get(f"http://127.0.0.1:{self.port}/health", timeout=1)
-                if resp.status_code == 200:
-                    print(f"✓ vLLM ready (took {elapsed}s)")
-                    return self.port, self.served_model_name
-            except:
-                pass
-            
-            # Show progress every 30s
-            if elapsed > 0 and elapsed % 30 == 0:
-                print(f"  Still waiting... {elapsed}s elapsed")
+                response = requests.head(f"{endpoint}/{model_ref}", timeout=5)
+                if response.status_code == 200:
+                    report.append(f"✓ {name} model accessible: {model_ref}")
+                    return report
+                report.append(f"⚠ {name} returned status {response.status_code}")
+            except Exception as e:
+                report.append(f"⚠ Could not check {name}: {type(e).__name__}")
+        
+        report.append("⚠ Model accessibility check failed, but will continue anyway")
+        return report
+    
+    @staticmethod
+    def _report_log_errors(log_reader, partial_line: str) -> str:
+        """Print error lines newly appended to the vLLM log
+        
+        Args:
+            log_reader: Open log file positioned after the last read
+            partial_line: Incomplete trailing line left by the previous read
             
-            time.sleep(check_interval)
+        Returns:
+            Incomplete trailing line of this read
+        """
+        chunk = log_reader.read()
+        if not chunk:
+            return partial_line
+        
+        lines = (partial_line + chunk).split('\n')
+        for line in lines[:-1]:
+            if 'ERROR' in line or 'Exception' in line:
+                print(f"  [vLLM] {line}")
+        return lines[-1]
     
     def _show_log_tail(self, log_path: Path, lines: int = 50):
         """Show last lines of log file"""
@@ -181,8 +364,8 @@ class VLLMService:
             return
         
         try:
-            with open(log_path) as f:
-                tail = f.readlines()[-lines:]
+            with open(log_path, errors='replace') as f:
+                tail = list(deque(f, maxlen=lines))
                 if tail:
                     print(f"\nLast {len(tail)} lines of log:")
                     print('='*60)
@@ -193,13 +376,26 @@ class VLLMService:
     
     def stop(self):
         """Stop vLLM service"""
+        import signal
+        
         if self.process is not None:
+            self._stopping = True
+            atexit.unregister(self.stop)
             print(f"Stopping vLLM service (PID={self.process.pid})")
+            # The server leads its own session, so its pid is the group id;
+            # signalling the group also stops worker and tokenizer processes
+            pgid = self.process.pid
             try:
-                self.process.terminate()
+                os.killpg(pgid, signal.SIGTERM)
                 self.process.wait(timeout=10)
-            except:
-                self.process.kill()
+            except ProcessLookupError:
+                pass
+            except subprocess.TimeoutExpired:
+                try:
+                    os.killpg(pgid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.process.wait()
             self.process = None
             self.port = None
             self.served_model_name = None
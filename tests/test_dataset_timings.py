@@ -0,0 +1,41 @@
+"""Per-dataset timings reconstructed from evalscope output file mtimes"""
+
+import os
+
+from evalscope_toolkit.evaluator import Evaluator
+
+
+T0 = 1_000_000.0
+T1 = T0 + 100
+
+
+def _touch(path, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('x')
+    os.utime(path, (mtime, mtime))
+
+
+def test_overlapping_names_missing_outputs_and_stale_files(tmp_path):
+    _touch(tmp_path / "predictions" / "mmlu.jsonl", T0 + 10)
+    _touch(tmp_path / "reviews" / "mmlu_pro_review.jsonl", T0 + 40)
+    _touch(tmp_path / "reports" / "mmlu_pro.json", T0 + 60)
+    # Left over from an earlier run, so it must not count
+    _touch(tmp_path / "reports" / "mmlu_report.json", T0 - 50)
+    _touch(tmp_path / "reports" / "gsm8k.json", T0 - 10)
+    
+    timings = Evaluator._dataset_timings(tmp_path, ["mmlu_pro", "mmlu", "gsm8k"], T0, T1)
+    
+    # mmlu_pro files are not credited to mmlu, despite the shared prefix
+    assert timings["mmlu"] == (T0, T0 + 10)
+    assert timings["mmlu_pro"] == (T0 + 10, T0 + 60)
+    # No output newer than t0: the dataset takes the rest of the invocation
+    assert timings["gsm8k"] == (T0 + 60, T1)
+
+
+def test_end_times_are_clamped_to_the_invocation(tmp_path):
+    # e.g. clock skew on a network filesystem
+    _touch(tmp_path / "gsm8k.jsonl", T1 + 30)
+    
+    timings = Evaluator._dataset_timings(tmp_path, ["gsm8k"], T0, T1)
+    
+    assert timings["gsm8k"] == (T0, T1)
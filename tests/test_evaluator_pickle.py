@@ -0,0 +1,23 @@
+"""Evaluator must pickle so --parallel-replicas can ship it to worker processes"""
+
+import pickle
+
+from evalscope_toolkit.config import EvalConfig
+from evalscope_toolkit.evaluator import Evaluator
+
+
+def test_evaluator_roundtrips_through_pickle(tmp_path):
+    evaluator = Evaluator(EvalConfig(workspace=tmp_path))
+    try:
+        clone = pickle.loads(pickle.dumps(evaluator))
+        try:
+            assert clone.base_log_dir == evaluator.base_log_dir
+            assert clone._overall_fh is not None
+            # Locks are recreated rather than shared
+            assert clone.dataset_manager._print_lock is not evaluator.dataset_manager._print_lock
+            with clone.dataset_manager._install_lock:
+                pass
+        finally:
+            clone.close()
+    finally:
+        evaluator.close()